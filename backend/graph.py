@@ -1,11 +1,24 @@
 import os
+import numpy as np
 import pandas as pd
 import networkx as nx
 from collections import deque
+from functools import lru_cache
 import dash
 from dash import dcc, html
 import plotly.graph_objects as go
 
+# layout do mapa, igual em todas as figuras
+MAP_LAYOUT = dict(
+    geo=dict(
+        projection_type='natural earth',
+        showland=True, landcolor='rgb(243,243,243)',
+        showocean=True, oceancolor='rgb(230,245,255)',
+        showcountries=True, countrycolor='rgb(204,204,204)'
+    ),
+    margin=dict(l=0,r=0,t=0,b=0)
+)
+
 # BFS
 def bfs_shortest_path(graph, source, target):
     if source not in graph or target not in graph:
@@ -26,26 +39,47 @@ def bfs_shortest_path(graph, source, target):
                 queue.append(neighbor)
     return []
 
+# coordenadas e nomes de todos os nós, na ordem de G.nodes()
+def node_arrays(G):
+    lons = np.fromiter((lon for _, lon in G.nodes(data='lon')), dtype=np.float32, count=len(G))
+    lats = np.fromiter((lat for _, lat in G.nodes(data='lat')), dtype=np.float32, count=len(G))
+    names = [name for _, name in G.nodes(data='name')]
+    return lons, lats, names
+
+# linhas de todas as arestas num único par de arrays, com os segmentos separados por NaN
+# (o Scattergeo interrompe a linha no NaN e desenha cada segmento como arco de círculo máximo);
+# as extremidades saem dos arrays de node_arrays, indexados pelas posições dos nós de cada aresta,
+# e cada linha dos buffers recebe as duas extremidades seguidas do NaN
+def edge_line_arrays(G, node_lons, node_lats):
+    index = {n: i for i, n in enumerate(G.nodes())}
+    edges = np.array([(index[u], index[v]) for u, v in G.edges()], dtype=np.intp).reshape(-1, 2)
+    lons = np.full((len(edges), 3), np.nan, dtype=np.float32)
+    lats = np.full((len(edges), 3), np.nan, dtype=np.float32)
+    lons[:, :2] = node_lons[edges]
+    lats[:, :2] = node_lats[edges]
+    return lons.ravel(), lats.ravel()
+
 # plotar grafo geográfico
-def plot_geo_graph(G, path=[]):
+# edges: (lons, lats) de edge_line_arrays; nodes: (lons, lats, names) de node_arrays,
+# montados uma única vez no carregamento; G só é consultado para o caminho
+def plot_geo_graph(G, path, edges, nodes):
+    edge_lons, edge_lats = edges
+    node_lons, node_lats, node_names = nodes
+    
     # arestas
-    edge_traces = []
-    for u, v in G.edges():
-        x = [G.nodes[u]['lon'], G.nodes[v]['lon']]
-        y = [G.nodes[u]['lat'], G.nodes[v]['lat']]
-        edge_traces.append(go.Scattergeo(
-            lon=x,
-            lat=y,
-            mode='lines',
-            line=dict(width=0.5, color='grey'),
-            hoverinfo='none'
-        ))
+    edge_trace = go.Scattergeo(
+        lon=edge_lons,
+        lat=edge_lats,
+        mode='lines',
+        line=dict(width=0.5, color='grey'),
+        hoverinfo='skip'
+    )
     
     # nós
     node_trace = go.Scattergeo(
-        lon=[G.nodes[n]['lon'] for n in G.nodes()],
-        lat=[G.nodes[n]['lat'] for n in G.nodes()],
-        text=[G.nodes[n]['name'] for n in G.nodes()],
+        lon=node_lons,
+        lat=node_lats,
+        text=node_names,
         mode='markers',
         marker=dict(size=6, color='blue'),
         hoverinfo='text'
@@ -61,20 +95,12 @@ def plot_geo_graph(G, path=[]):
         hoverinfo='none'
     ) if path else None
     
-    data = edge_traces + [node_trace]
+    data = [edge_trace, node_trace]
     if path_trace:
         data.append(path_trace)
     
     fig = go.Figure(data=data)
-    fig.update_layout(
-        geo=dict(
-            projection_type='natural earth',
-            showland=True, landcolor='rgb(243,243,243)',
-            showocean=True, oceancolor='rgb(230,245,255)',
-            showcountries=True, countrycolor='rgb(204,204,204)'
-        ),
-        margin=dict(l=0,r=0,t=0,b=0)
-    )
+    fig.update_layout(MAP_LAYOUT)
     return fig
 
 # carregar dados 
@@ -87,16 +113,57 @@ routes_file = os.path.join(data_dir, "routes_min.csv")
 if not os.path.exists(airports_file) or not os.path.exists(routes_file):
     raise FileNotFoundError("Certifique-se de que os arquivos CSV estão em ../data/")
 
-airports_df = pd.read_csv(airports_file)
-routes_df = pd.read_csv(routes_file)
+# a coluna iata é opcional: arquivos gerados antes dela continuam funcionando
+airports_df = pd.read_csv(
+    airports_file,
+    usecols=lambda c: c in {'id', 'name', 'iata', 'lat', 'lon'},
+    dtype={'id': np.int32, 'name': 'string', 'iata': 'string', 'lat': np.float32, 'lon': np.float32},
+    engine='c'
+)
+if 'iata' not in airports_df.columns:
+    airports_df['iata'] = ''
+airports_df['iata'] = airports_df['iata'].fillna('')
+routes_df = pd.read_csv(
+    routes_file,
+    usecols=['src_id', 'dst_id'],
+    dtype={'src_id': np.int32, 'dst_id': np.int32},
+    engine='c'
+)
+# mantém apenas rotas cujos dois aeroportos foram carregados
+routes_df = routes_df[routes_df['src_id'].isin(airports_df['id']) & routes_df['dst_id'].isin(airports_df['id'])]
 
 # cria grafo
 G = nx.Graph()
-for _, row in airports_df.iterrows():
-    G.add_node(row['id'], name=row['name'], lat=row['lat'], lon=row['lon'])
-for _, row in routes_df.iterrows():
-    if row['src_id'] in G.nodes and row['dst_id'] in G.nodes:
-        G.add_edge(row['src_id'], row['dst_id'])
+G.add_nodes_from(
+    (row.id, {'name': row.name, 'iata': row.iata, 'lat': row.lat, 'lon': row.lon})
+    for row in airports_df.itertuples(index=False)
+)
+G.add_edges_from(zip(routes_df['src_id'], routes_df['dst_id']))
+
+# arrays do mapa, montados uma única vez (o grafo não muda depois de carregado)
+map_nodes = node_arrays(G)
+map_edges = edge_line_arrays(G, map_nodes[0], map_nodes[1])
+
+# lista de adjacência simples, montada uma única vez para a BFS
+adjacency = {n: list(neighbors) for n, neighbors in G.adj.items()}
+
+# caminhos já calculados, indexados pelo par ordenado (o grafo é não direcionado
+# e não muda depois de carregado, então o caminho de volta é o de ida invertido)
+@lru_cache(maxsize=4096)
+def _cached_shortest_path(source, target):
+    return tuple(bfs_shortest_path(adjacency, source, target))
+
+def shortest_path(source, target):
+    if source <= target:
+        return list(_cached_shortest_path(source, target))
+    return list(reversed(_cached_shortest_path(target, source)))
+
+# opções dos dropdowns, montadas uma única vez para origem e destino
+# (o código IATA no rótulo permite buscar o aeroporto pelo código)
+airport_options = [
+    {"label": f"{attrs['name']} ({attrs['iata']})" if attrs['iata'] else attrs['name'], "value": n}
+    for n, attrs in G.nodes(data=True)
+]
 
 # cria app Dash
 app = dash.Dash(__name__)
@@ -107,7 +174,7 @@ app.layout = html.Div([
         html.Label("Origem:"),
         dcc.Dropdown(
             id="source",
-            options=[{"label": G.nodes[n]['name'], "value": n} for n in G.nodes],
+            options=airport_options,
             placeholder="Selecione aeroporto de origem"
         ),
     ], style={"width": "48%", "display": "inline-block"}),
@@ -115,7 +182,7 @@ app.layout = html.Div([
         html.Label("Destino:"),
         dcc.Dropdown(
             id="target",
-            options=[{"label": G.nodes[n]['name'], "value": n} for n in G.nodes],
+            options=airport_options,
             placeholder="Selecione aeroporto de destino"
         ),
     ], style={"width": "48%", "display": "inline-block"}),
@@ -131,9 +198,9 @@ app.layout = html.Div([
      dash.Input("target", "value")]
 )
 def update_graph(source, target):
-    path = bfs_shortest_path(G, source, target) if source and target else []
+    path = shortest_path(source, target) if source and target else []
     path_text = " → ".join([G.nodes[n]['name'] for n in path]) if path else "Selecione dois aeroportos ou não há caminho."
-    fig = plot_geo_graph(G, path)
+    fig = plot_geo_graph(G, path, map_edges, map_nodes)
     return fig, path_text
 
 # roda app
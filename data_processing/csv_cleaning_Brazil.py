@@ -1,5 +1,9 @@
-import csv
 import os
+import pandas as pd
+
+# Colunas dos arquivos gerados (fazem parte da assinatura do cache)
+AIRPORTS_COLUMNS = ['id', 'name', 'iata', 'icao', 'lat', 'lon']
+ROUTES_COLUMNS = ['src_id', 'dst_id']
 
 def process_airports_data():
     """
@@ -10,42 +14,31 @@ def process_airports_data():
     input_file = os.path.join(base_dir, '..', 'data', 'airports.dat')
     output_file = os.path.join(base_dir, '..', 'data', 'airports_min.csv')
     
-    airports_processed = 0
-    airports_skipped = 0
-    
     try:
-        with open(input_file, 'r', encoding='utf-8') as infile, \
-             open(output_file, 'w', newline='', encoding='utf-8') as outfile:
-            
-            reader = csv.reader(infile)
-            writer = csv.writer(outfile)
-            
-            # Escrever cabeçalho
-            writer.writerow(['id', 'name', 'lat', 'lon'])
-            
-            for row in reader:
-                if len(row) >= 8:
-                    airport_id = row[0]
-                    name = row[1]
-                    country = row[3]
-                    latitude = row[6]
-                    longitude = row[7]
-                    
-                    # Filtrar apenas aeroportos do Brasil
-                    if country.strip().upper() != 'BRAZIL':
-                        airports_skipped += 1
-                        continue
-                    
-                    # Verificar se lat/lon são válidos
-                    try:
-                        float(latitude)
-                        float(longitude)
-                        writer.writerow([airport_id, name, latitude, longitude])
-                        airports_processed += 1
-                    except ValueError:
-                        print(f"Coordenadas inválidas para aeroporto {airport_id}: lat={latitude}, lon={longitude}")
-                        airports_skipped += 1
-                        continue
+        # Lê apenas as colunas usadas, mantendo os valores como texto
+        airports = pd.read_csv(input_file, header=None, usecols=[0, 1, 3, 4, 5, 6, 7], dtype=str,
+                               keep_default_na=False, encoding='utf-8', engine='c')
+        airports.columns = ['id', 'name', 'country', 'iata', 'icao', 'lat', 'lon']
+        
+        # Códigos ausentes aparecem como \N no arquivo original
+        airports[['iata', 'icao']] = airports[['iata', 'icao']].replace('\\N', '')
+        
+        # Filtrar apenas aeroportos do Brasil
+        is_brazilian = airports['country'].str.strip().str.upper() == 'BRAZIL'
+        airports_skipped = int((~is_brazilian).sum())
+        airports = airports[is_brazilian]
+        
+        # Verificar se lat/lon são válidos
+        valid_coords = (pd.to_numeric(airports['lat'], errors='coerce').notna() &
+                        pd.to_numeric(airports['lon'], errors='coerce').notna())
+        invalid = airports[~valid_coords]
+        for airport_id, latitude, longitude in zip(invalid['id'], invalid['lat'], invalid['lon']):
+            print(f"Coordenadas inválidas para aeroporto {airport_id}: lat={latitude}, lon={longitude}")
+        airports_skipped += len(invalid)
+        airports = airports[valid_coords]
+        
+        airports[AIRPORTS_COLUMNS].to_csv(output_file, index=False, encoding='utf-8')
+        airports_processed = len(airports)
     
     except FileNotFoundError:
         print(f"Arquivo {input_file} não encontrado!")
@@ -58,13 +51,7 @@ def process_airports_data():
     print(f"Ignorados {airports_skipped} aeroportos de outros países")
     
     # Retorna também os IDs dos aeroportos brasileiros para usar no filtro de rotas
-    brazilian_airport_ids = set()
-    try:
-        with open(output_file, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            brazilian_airport_ids = {row['id'] for row in reader}
-    except Exception as e:
-        print(f"Erro ao ler IDs dos aeroportos brasileiros: {e}")
+    brazilian_airport_ids = set(airports['id'])
     
     return airports_processed, brazilian_airport_ids
 
@@ -77,43 +64,25 @@ def process_routes_data(brazilian_airport_ids):
     input_file = os.path.join(base_dir, '..', 'data', 'routes.dat')
     output_file = os.path.join(base_dir, '..', 'data', 'routes_min.csv')
     
-    routes_processed = 0
-    invalid_routes = 0
-    non_brazilian_routes = 0
-    
     try:
-        with open(input_file, 'r', encoding='utf-8') as infile, \
-             open(output_file, 'w', newline='', encoding='utf-8') as outfile:
-            
-            reader = csv.reader(infile)
-            writer = csv.writer(outfile)
-            
-            # Escrever cabeçalho
-            writer.writerow(['src_id', 'dst_id'])
-            
-            unique_routes = set()
-            for row in reader:
-                if len(row) >= 6:  # Garantir que temos dados suficientes
-                    src_airport_id = row[3]  # Source airport ID
-                    dst_airport_id = row[5]  # Destination airport ID
-                    
-                    # Verificar se os IDs são válidos (não são \N e são numéricos)
-                    if (src_airport_id != '\\N' and dst_airport_id != '\\N' and 
-                        src_airport_id.isdigit() and dst_airport_id.isdigit()):
-                        
-                        # Verificar se ambos os aeroportos são brasileiros
-                        if (src_airport_id in brazilian_airport_ids and 
-                            dst_airport_id in brazilian_airport_ids):
-                            
-                            route_key = (src_airport_id, dst_airport_id)
-                            if route_key not in unique_routes:
-                                writer.writerow([src_airport_id, dst_airport_id])
-                                unique_routes.add(route_key)
-                                routes_processed += 1
-                        else:
-                            non_brazilian_routes += 1
-                    else:
-                        invalid_routes += 1
+        # Source airport ID (coluna 3) e Destination airport ID (coluna 5)
+        routes = pd.read_csv(input_file, header=None, usecols=[3, 5], dtype=str,
+                             keep_default_na=False, encoding='utf-8', engine='c')
+        routes.columns = ['src_id', 'dst_id']
+        
+        # Verificar se os IDs são válidos (não são \N e são numéricos)
+        valid_ids = routes['src_id'].str.isdigit() & routes['dst_id'].str.isdigit()
+        invalid_routes = int((~valid_ids).sum())
+        routes = routes[valid_ids]
+        
+        # Verificar se ambos os aeroportos são brasileiros
+        is_brazilian = (routes['src_id'].isin(brazilian_airport_ids) &
+                        routes['dst_id'].isin(brazilian_airport_ids))
+        non_brazilian_routes = int((~is_brazilian).sum())
+        routes = routes[is_brazilian].drop_duplicates()
+        
+        routes[ROUTES_COLUMNS].to_csv(output_file, index=False, encoding='utf-8')
+        routes_processed = len(routes)
     
     except FileNotFoundError:
         print(f"Arquivo {input_file} não encontrado!")
@@ -127,6 +96,39 @@ def process_routes_data(brazilian_airport_ids):
     print(f"Ignoradas {non_brazilian_routes} rotas que não são inteiramente brasileiras")
     return routes_processed
 
+def input_signature(input_files):
+    """
+    Assinatura do processamento: datas de modificação dos arquivos de entrada e deste
+    script, mais as colunas geradas. Retorna None se algum arquivo não existir
+    """
+    try:
+        mtimes = [repr(os.path.getmtime(f)) for f in input_files + [os.path.abspath(__file__)]]
+    except OSError:
+        return None
+    return ' '.join(mtimes + [','.join(AIRPORTS_COLUMNS), ','.join(ROUTES_COLUMNS)])
+
+def has_expected_header(csv_file, columns):
+    """
+    Verifica se o arquivo existe e começa com as colunas esperadas
+    (colunas extras, como distance_km em routes_min.csv, são aceitas)
+    """
+    try:
+        with open(csv_file, 'r', encoding='utf-8') as f:
+            header = f.readline().strip().split(',')
+    except OSError:
+        return False
+    return header[:len(columns)] == columns
+
+def read_signature(signature_file):
+    """
+    Lê a assinatura salva no último processamento, ou None se não houver
+    """
+    try:
+        with open(signature_file, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
 def main():
     """
     Função principal que executa o processamento dos dados filtrados para o Brasil
@@ -134,6 +136,25 @@ def main():
     print("Iniciando processamento dos dados de aeroportos e rotas do Brasil...")
     print("=" * 70)
     
+    # Os arquivos gerados só dependem de airports.dat, routes.dat e deste script: se nada
+    # mudou desde o último processamento e as saídas têm o formato esperado, não há nada a refazer
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+    input_files = [os.path.join(data_dir, 'airports.dat'), os.path.join(data_dir, 'routes.dat')]
+    output_files = {
+        os.path.join(data_dir, 'airports_min.csv'): AIRPORTS_COLUMNS,
+        os.path.join(data_dir, 'routes_min.csv'): ROUTES_COLUMNS,
+    }
+    signature_file = os.path.join(data_dir, '.min_csv.sig')
+    
+    signature = input_signature(input_files)
+    if (signature is not None and
+            all(has_expected_header(f, columns) for f, columns in output_files.items()) and
+            read_signature(signature_file) == signature):
+        print("✓ airports.dat, routes.dat e este script não mudaram desde o último processamento")
+        print("✓ Arquivos airports_min.csv e routes_min.csv já estão atualizados (cache)")
+        print(f"💡 Para forçar o reprocessamento, apague {os.path.normpath(signature_file)}")
+        return
+    
     # Processar aeroportos brasileiros
     print("1. Processando dados de aeroportos brasileiros...")
     airports_count, brazilian_airport_ids = process_airports_data()
@@ -148,12 +169,16 @@ def main():
     print("\n2. Processando rotas entre aeroportos brasileiros...")
     routes_count = process_routes_data(brazilian_airport_ids)
     
+    if signature is not None and routes_count > 0:
+        with open(signature_file, 'w', encoding='utf-8') as f:
+            f.write(signature)
+    
     print("\n" + "=" * 70)
     print("RESUMO DO PROCESSAMENTO (APENAS BRASIL):")
     print(f"✓ Aeroportos brasileiros processados: {airports_count}")
     print(f"✓ Rotas entre aeroportos brasileiros: {routes_count}")
     print("\nArquivos gerados:")
-    print("- ../data/airports_min.csv (aeroportos do Brasil: id, name, lat, lon)")
+    print("- ../data/airports_min.csv (aeroportos do Brasil: id, name, iata, icao, lat, lon)")
     print("- ../data/routes_min.csv (rotas domésticas brasileiras: src_id, dst_id)")
 
 if __name__ == "__main__":
@@ -1,27 +1,27 @@
 import pandas as pd
 import numpy as np
-from math import radians, cos, sin, asin, sqrt
 import os
 
 def haversine_distance(lat1, lon1, lat2, lon2):
     """
-    Calcula a distância haversine entre dois pontos na Terra em quilômetros.
+    Calcula a distância haversine entre pontos na Terra em quilômetros.
+    Aceita escalares ou arrays NumPy, calculando todas as distâncias de uma vez.
     
     Args:
         lat1, lon1: Latitude e longitude do primeiro ponto em graus
         lat2, lon2: Latitude e longitude do segundo ponto em graus
     
     Returns:
-        Distância em quilômetros
+        Distância em quilômetros (escalar ou array)
     """
     # Converte graus para radianos
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    lat1, lon1, lat2, lon2 = np.radians([lat1, lon1, lat2, lon2])
     
     # Fórmula de Haversine
     dlat = lat2 - lat1
     dlon = lon2 - lon1
-    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-    c = 2 * asin(sqrt(a))
+    a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
+    c = 2 * np.arcsin(np.sqrt(a))
     
     # Raio médio da Terra em quilômetros
     r = 6371
@@ -43,45 +43,39 @@ def add_distances_to_routes():
     
     print("Carregando dados...")
     # Carrega os dados
-    airports_df = pd.read_csv(airports_file)
-    routes_df = pd.read_csv(routes_file)
+    airports_df = pd.read_csv(
+        airports_file,
+        usecols=['id', 'name', 'lat', 'lon'],
+        dtype={'id': np.int32, 'name': 'string', 'lat': np.float64, 'lon': np.float64},
+        engine='c'
+    )
+    routes_df = pd.read_csv(routes_file, dtype={'src_id': np.int32, 'dst_id': np.int32}, engine='c')
     
     print(f"Aeroportos carregados: {len(airports_df)}")
     print(f"Rotas carregadas: {len(routes_df)}")
     
-    # Cria dicionário para acesso rápido aos dados dos aeroportos
-    airports_dict = {}
-    for _, airport in airports_df.iterrows():
-        airports_dict[airport['id']] = {
-            'name': airport['name'],
-            'lat': airport['lat'],
-            'lon': airport['lon']
-        }
+    # Cria dicionário id -> nome para acesso rápido aos nomes dos aeroportos
+    airport_names = dict(zip(airports_df['id'], airports_df['name']))
     
     print("Calculando distâncias...")
-    distances = []
-    routes_with_missing_airports = 0
+    # Junta as coordenadas de origem e destino a cada rota (left join preserva a ordem
+    # das rotas; aeroportos não encontrados ficam com NaN)
+    coords = airports_df[['id', 'lat', 'lon']]
+    merged = routes_df[['src_id', 'dst_id']].merge(
+        coords.rename(columns={'id': 'src_id', 'lat': 'src_lat', 'lon': 'src_lon'}),
+        on='src_id', how='left'
+    ).merge(
+        coords.rename(columns={'id': 'dst_id', 'lat': 'dst_lat', 'lon': 'dst_lon'}),
+        on='dst_id', how='left'
+    )
     
-    # Calcula a distância para cada rota
-    for idx, route in routes_df.iterrows():
-        src_id = route['src_id']
-        dst_id = route['dst_id']
-        
-        # Verifica se ambos os aeroportos existem nos dados
-        if src_id in airports_dict and dst_id in airports_dict:
-            src_airport = airports_dict[src_id]
-            dst_airport = airports_dict[dst_id]
-            
-            # Calcula a distância
-            distance = haversine_distance(
-                src_airport['lat'], src_airport['lon'],
-                dst_airport['lat'], dst_airport['lon']
-            )
-            distances.append(round(distance, 2))
-        else:
-            # Se algum aeroporto não for encontrado, adiciona NaN
-            distances.append(np.nan)
-            routes_with_missing_airports += 1
+    # Calcula a distância de todas as rotas de uma só vez
+    distances = haversine_distance(
+        merged['src_lat'].to_numpy(), merged['src_lon'].to_numpy(),
+        merged['dst_lat'].to_numpy(), merged['dst_lon'].to_numpy()
+    )
+    distances = pd.Series(np.round(distances, 2), index=routes_df.index)
+    routes_with_missing_airports = int(distances.isna().sum())
     
     # Adiciona a coluna de distância ao DataFrame
     routes_df['distance_km'] = distances
@@ -106,10 +100,12 @@ def add_distances_to_routes():
         # Mostra alguns exemplos
         print(f"\n=== EXEMPLOS DE ROTAS ===")
         sample_routes = routes_df.dropna().head(10)
-        for _, route in sample_routes.iterrows():
-            src_name = airports_dict[route['src_id']]['name']
-            dst_name = airports_dict[route['dst_id']]['name']
-            print(f"{src_name} → {dst_name}: {route['distance_km']:.2f} km")
+        for src_id, dst_id, distance in zip(sample_routes['src_id'],
+                                            sample_routes['dst_id'],
+                                            sample_routes['distance_km']):
+            src_name = airport_names[src_id]
+            dst_name = airport_names[dst_id]
+            print(f"{src_name} → {dst_name}: {distance:.2f} km")
 
 if __name__ == "__main__":
     try:
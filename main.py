@@ -38,7 +38,7 @@ def main():
     except Exception as e:
         print(f"❌ Erro inesperado: {e}")
         print("💡 Verifique se todas as dependências estão instaladas:")
-        print("   pip install pandas networkx dash plotly")
+        print("   pip install pandas numpy networkx dash plotly")
         sys.exit(1)
 
 if __name__ == "__main__":